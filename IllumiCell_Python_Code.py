@@ -1,782 +1,1183 @@
 import tkinter as tk
-from tkinter import messagebox, filedialog
+import tkinter.font as tkfont
+from tkinter import messagebox, filedialog, ttk
 import serial
 import time
 import json
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-
-sensor_data_window = None
-sensor_values = []
-times = []
-time_counter = 0
-scheduled_tasks = []
-scheduled_task_id = None
-queue = []
-arduino = None
-start_time = None
-elapsed_time = 0
-experiment_running = False
-
-
-# Function to display an initial instructions page for user to understand functionalities of the interface,
-# including adding steps, saving experiments, and controlling the experiment (start/stop).
-def show_instructions_overlay():
-    overlay_frame = tk.Frame(root, bg="#1E90FF", width=1350, height=700)
-    overlay_frame.place(relx=0.5, rely=0.59, anchor="center")
-
-    root.after(100, lambda: overlay_frame.lift())
-
-    instructions_label = tk.Label(overlay_frame, text="Welcome to IllumiCell!\n\n"
-                                                     "Instructions:\n\n"
-                                                     "1. Click 'Add Step' to create your experiment.\n"
-                                                     "2. Use 'Save' and 'Open saved files' to save and load experiments.\n"
-                                                     "3. Click 'Clear all' to reset the experiment queue.\n"
-                                                     "4. Click 'Run' to start the experiment.\n"
-                                                     "5. Click 'Stop' to halt a running experiment.\n"
-                                                     "6. Click 'View sensor data' for real-time sensor recordings during the experiment.\n"
-
-                                                     "\nClick 'OK' to continue.",
-                             font=("Helvetica", 16), bg="#1E90FF", justify="center")
-    instructions_label.pack(padx = 50, pady=37)
-
-    ok_button = tk.Button(overlay_frame, text="OK", command=overlay_frame.destroy,
-                          bg="blue", fg="white", font=("Helvetica", 14), width=4)
-    ok_button.pack(pady=20)
-
-
-# Function to initialize the connection to the Arduino board.
-# This function attempts to open the serial connection on COM8 with a baud rate of 9600.
-# If the connection is unsuccessful, it shows an error message to the user.
-def initialize_arduino():
-    global arduino
-    try:
-        arduino = serial.Serial('COM8', 9600)
-        time.sleep(2)
-    except serial.SerialException as e:
-        messagebox.showerror('Error', f'Failed to connect to Arduino: {e}')
-
-
-# Function to send a command to the connected Arduino board.
-# This function checks if the Arduino connection is open, and if so, sends the given command.
-# If the connection is not open or the command fails, an error message is shown.
-def send_to_arduino(command):
-    if arduino.isOpen():
+import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict
+import re
+import numpy as np
+import itertools
+import threading
+from queue import SimpleQueue, Empty
+from collections import OrderedDict
+
+INFO_ICON_FILE = "C:\\Users\\lucia\\OneDrive - Imperial College London\\##Year 3 AFTER interruption\\Group project\\#GUI\\info_icon.png"
+INFO_ICON_SMALL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "info_icon_small.png")
+
+SENSOR_HISTORY = 65536
+SENSOR_PLOT_SECONDS = 60
+SENSOR_BINARY_FRAMES = False  # Set to True for Arduino sketches that send readings as binary frames
+SENSOR_FRAME_HEADER = 0xAA
+SENSOR_FRAME = np.dtype([('header', 'u1'), ('lux', '<u2')])
+
+OPENED_EXPERIMENTS_KEPT = 8  # Number of parsed experiment files remembered for reopening
+
+# Matches entry field contents made up only of digits (or nothing), checked on every keystroke.
+DIGITS_ONLY = re.compile(r'\d*').fullmatch
+
+# Command sent to the Arduino at the start of each type of step, filled in from the step's values.
+STEP_COMMANDS = {
+    'Continuous light': "ON {0.duration} {0.lux}\n",
+    'No light': "OFF {0.duration}\n",
+    'Pulsing light': "PULSING {0.duration} {0.rate} {0.lux}\n",
+    'Advanced pulsing light': "ADV_PULSING {0.duration} {0.on_ms} {0.off_ms} {0.lux}\n",
+}
+
+# Text shown in the experiment queue for each type of step, filled in from the step's values.
+STEP_DESCRIPTIONS = {
+    'Continuous light': "{0.kind} for {0.duration} seconds at {0.lux} lux",
+    'No light': "{0.kind} for {0.duration} seconds",
+    'Pulsing light': "{0.kind} for {0.duration} seconds - Frequency: {0.rate} Hz, Intensity: {0.lux} lux",
+    'Advanced pulsing light': "{0.kind} for {0.duration} seconds - On: {0.on_ms} ms, Off: {0.off_ms} ms, "
+                              "Intensity: {0.lux} lux",
+}
+
+# Fields stored after the step type and duration in experiments saved as lists, for each type of step.
+LEGACY_STEP_FIELDS = {
+    'Continuous light': ('lux',),
+    'No light': (),
+    'Pulsing light': ('rate', 'lux'),
+    'Advanced pulsing light': ('on_ms', 'off_ms', 'lux'),
+}
+
+
+# A single step of the experiment: the type of step, its duration in seconds, and the light settings
+# that apply to that type of step (intensity in lux, pulse rate in Hz, and pulse on/off times in ms).
+@dataclass(slots=True)
+class Step:
+    kind: str
+    duration: int
+    lux: int = 0
+    rate: int = 0
+    on_ms: int = 0
+    off_ms: int = 0
+
+    # Builds a step from its saved JSON form, which is either a dictionary of fields or, for experiments
+    # saved by earlier versions, a list starting with the step type and duration. Unknown step types are
+    # rejected here, so a file containing one adds nothing to the queue.
+    @classmethod
+    def from_saved(cls, saved):
+        if isinstance(saved, dict):
+            if saved.get('kind') not in STEP_COMMANDS:
+                raise ValueError(f"unknown step type {saved.get('kind')!r}")
+            return cls(**saved)
+        kind, duration, *values = saved
+        return cls(kind, duration, **dict(zip(LEGACY_STEP_FIELDS[kind], values)))
+
+
+# Reads and parses a saved experiment file. This runs in the separate process used to open experiments, so
+# neither reading nor parsing the file holds up the interface.
+def load_experiment_file(file_path):
+    return json.loads(Path(file_path).read_bytes())
+
+
+# Keeps the most recent sensor readings and the monotonic time (in ns) each was received, in fixed-size NumPy
+# arrays used as a ring buffer: the count of readings so far picks the slot to overwrite. The serial thread
+# adds readings while the sensor data window copies them out, so both go through a lock.
+class SensorHistory:
+    def __init__(self, size):
+        self.size = size
+        self.received_at = np.zeros(size, dtype=np.int64)
+        self.values = np.zeros(size, dtype=np.float32)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, received_at, value):
+        with self.lock:
+            slot = self.count % self.size
+            self.received_at[slot] = received_at
+            self.values[slot] = value
+            self.count += 1
+
+    def extend(self, received_at, values):
+        values = values[-self.size:]
+        with self.lock:
+            slots = (self.count + np.arange(len(values))) % self.size
+            self.received_at[slots] = received_at
+            self.values[slots] = values
+            self.count += len(values)
+
+    def clear(self):
+        with self.lock:
+            self.count = 0
+
+    # Returns copies of the receive times and values, oldest reading first.
+    def latest(self):
+        with self.lock:
+            if self.count <= self.size:
+                return self.received_at[:self.count].copy(), self.values[:self.count].copy()
+            oldest = self.count % self.size
+            return (np.concatenate((self.received_at[oldest:], self.received_at[:oldest])),
+                    np.concatenate((self.values[oldest:], self.values[:oldest])))
+
+
+# Collects the bytes received from the Arduino and turns them into timestamped sensor readings.
+# Everything waiting on the serial port is read in one call and decoded in memory; an incomplete reading at the
+# end is kept in the buffer until the rest of it arrives. Readings are either text lines, or 3-byte binary frames
+# (a header byte followed by the lux value as a little-endian 16-bit integer) when SENSOR_BINARY_FRAMES is set.
+class SensorReader:
+    def __init__(self, port, readings):
+        self.port = port
+        self.readings = readings
+        self.buffer = bytearray()
+
+    def read_available(self):
+        waiting = self.port.in_waiting
+        if not waiting:
+            return
+        self.buffer += self.port.read(waiting)
+        if SENSOR_BINARY_FRAMES:
+            self.read_frames()
+        else:
+            self.read_lines()
+
+    def read_lines(self):
+        *lines, self.buffer = self.buffer.split(b'\n')
+        received_at = time.monotonic_ns()
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                self.readings.append(received_at, float(line))
+            except ValueError:
+                print(f"Received: {line.decode('utf-8', 'replace')}")
+
+    # Runs of complete frames are decoded in one go as a NumPy structured array. Bytes that do not start with
+    # a header byte (such as text messages from the Arduino) are skipped until the next header.
+    def read_frames(self):
+        received_at = time.monotonic_ns()
+        start = self.buffer.find(SENSOR_FRAME_HEADER)
+        while start != -1:
+            count = (len(self.buffer) - start) // SENSOR_FRAME.itemsize
+            frames = np.frombuffer(bytes(self.buffer[start:start + count * SENSOR_FRAME.itemsize]), dtype=SENSOR_FRAME)
+            misaligned = np.flatnonzero(frames['header'] != SENSOR_FRAME_HEADER)
+            valid = misaligned[0] if misaligned.size else count
+            self.readings.extend(received_at, frames['lux'][:valid])
+            start += valid * SENSOR_FRAME.itemsize
+            if not misaligned.size:
+                break
+            start = self.buffer.find(SENSOR_FRAME_HEADER, start + 1)
+        del self.buffer[:len(self.buffer) if start == -1 else start]
+
+
+# The IllumiCell interface: the main window and its widgets, the experiment queue, and the connection to
+# the Arduino. Nothing is built when the file is imported (e.g. by the process that parses opened
+# experiments); the window is only created when an IllumiCellApp is made.
+class IllumiCellApp:
+    def __init__(self):
+        self.sensor_data_window = None
+        self.sensor_update_id = None
+        self.start_sensor_graph = None
+        self.experiment_loader = None
+        self.opened_experiments = OrderedDict()
+        self.highlighted_steps = set()
+        self.listed_rows = []
+        self.experiment_runner = None
+        self.experiment_stopped = None
+        self.time_update_id = None
+        self.queue = []
+        self.arduino = None
+        self.arduino_commands = SimpleQueue()
+        self.arduino_errors = SimpleQueue()
+        self.sensor_readings = SensorHistory(SENSOR_HISTORY)
+        self.start_ns = None
+        self.shown_elapsed_time = None
+        self.experiment_running = False
+
+        self.root = tk.Tk()
+        self.build_ui()
+
+    # Builds the main IllumiCell GUI window, including the buttons, labels and listbox for managing and
+    # displaying the experiment queue.
+    def build_ui(self):
+        self.root.title("IllumiCell")
+        self.root.geometry("1350x700")
+        self.root.configure(bg="light blue")
+
+        # Each font is created once and shared by every widget that uses it, rather than every widget
+        # (including those in each Add Step window) passing its own font description for Tk to look up.
+        self.font_11 = tkfont.Font(family="Helvetica", size=11)
+        self.font_12 = tkfont.Font(family="Helvetica", size=12)
+        self.font_14 = tkfont.Font(family="Helvetica", size=14)
+        self.font_16 = tkfont.Font(family="Helvetica", size=16)
+        self.title_font = tkfont.Font(family="Helvetica", size=30, weight="bold")
+
+        # Buttons share one style per colour instead of each setting its own colours and font. The 'clam'
+        # theme is used because the native Windows and macOS themes ignore button background colours.
+        style = ttk.Style(self.root)
+        style.theme_use("clam")
+        for name, colour, active_colour in (("Blue", "blue", "#0000b3"),
+                                            ("Red", "red", "#b30000"),
+                                            ("Green", "green", "#005a00")):
+            style.configure(f"{name}.TButton", background=colour, foreground="white", font=self.font_14)
+            style.map(f"{name}.TButton", background=[("active", active_colour)])
+
+        self.show_instructions_overlay()
+
+        # All widgets of the main window are laid out on one grid inside a frame that is kept centered in the
+        # window. The widgets that are only shown some of the time are given their grid cell here once and
+        # then hidden with grid_remove(), so showing them again only needs grid(). Columns 1 to 3 hold the
+        # main widgets, and the outer columns 0 and 4 are kept the same width so that showing the delete
+        # button (in column 4) does not shift the rest of the window sideways.
+        self.root.rowconfigure(0, weight=1)
+        self.root.columnconfigure(0, weight=1)
+        self.main_frame = tk.Frame(self.root, bg="light blue")
+        self.main_frame.grid(row=0, column=0)
+        self.main_frame.columnconfigure((0, 4), uniform="side")
+        self.main_frame.columnconfigure((1, 2, 3), uniform="main")
+
+        self.title_label = tk.Label(self.main_frame, text="IllumiCell", font=self.title_font, bg="light blue")
+        self.title_label.grid(row=0, column=1, columnspan=3, pady=(0, 20))
+
+        self.description_label = tk.Label(self.main_frame,
+                                          text="Device that administers light to study the effects of in vitro activation of skin cell opsins",
+                                          font=self.font_16, bg="light blue", wraplength=650)
+        self.description_label.grid(row=1, column=1, columnspan=3, pady=(0, 20))
+
+        top_buttons = tk.Frame(self.main_frame, bg="light blue")
+        top_buttons.grid(row=2, column=1, columnspan=3, pady=(0, 20))
+
+        self.add_step_button = ttk.Button(top_buttons, text="Add step", command=self.open_add_step_window,
+                                          style="Blue.TButton", width=8)
+        self.add_step_button.grid(row=0, column=0, padx=20)
+
+        self.open_button = ttk.Button(top_buttons, text="Open saved files", command=self.open_experiment,
+                                      style="Blue.TButton", width=14)
+        self.open_button.grid(row=0, column=1, padx=20)
+
+        self.view_sensor_button = ttk.Button(top_buttons, text="View sensor data      ",
+                                             command=self.open_sensor_data_window, style="Blue.TButton", width=18)
+        self.view_sensor_button.grid(row=0, column=0, columnspan=2)  # Takes the place of the two buttons above
+        self.view_sensor_button.grid_remove()                        # during an experiment
+
+        # The info icon is shrunk once and saved next to this file, so later starts only load the small image.
+        # It is shrunk again if the original icon has changed since. If the small image cannot be saved (e.g.
+        # the folder is read-only), the shrunk icon is only kept in memory.
+        if os.path.exists(INFO_ICON_SMALL_FILE) and (not os.path.exists(INFO_ICON_FILE) or
+                                                     os.path.getmtime(INFO_ICON_SMALL_FILE) >= os.path.getmtime(INFO_ICON_FILE)):
+            self.image_resize = tk.PhotoImage(file=INFO_ICON_SMALL_FILE)
+        else:
+            self.image_resize = tk.PhotoImage(file=INFO_ICON_FILE).subsample(17, 17)
+            try:
+                self.image_resize.write(INFO_ICON_SMALL_FILE, format="png")
+            except (tk.TclError, OSError):
+                pass
+        self.info_icon = tk.Button(top_buttons, image=self.image_resize, command=self.open_sensor_data_window,
+                                   bg="blue", bd=0)
+        self.info_icon.grid(row=0, column=0, columnspan=2, sticky="e", padx=(0, 8))  # Drawn over the right end
+        self.info_icon.grid_remove()                                                 # of 'View sensor data'
+
+        self.queue_label = tk.Label(self.main_frame, text="Experiment queue:", font=self.font_16, bg="light blue")
+        self.queue_label.grid(row=3, column=1, columnspan=3, pady=(0, 10))
+
+        self.queue_listbox = tk.Listbox(self.main_frame, font=self.font_12, height=10, width=71, selectmode=tk.SINGLE, bg="white")
+        self.queue_listbox.grid(row=4, column=1, columnspan=3)
+
+        self.delete_button = ttk.Button(self.main_frame, text="Delete step", command=self.delete_step,
+                                        style="Red.TButton", width=10)
+        self.delete_button.grid(row=4, column=4, padx=20)
+        self.delete_button.grid_remove()
+
+        self.queue_listbox.bind("<ButtonRelease-1>", self.on_step_click)
+        self.root.bind("<Button-1>", self.on_click_outside)
+        self.click_inside_widgets = frozenset({id(self.delete_button), id(self.queue_listbox)})
+
+        self.save_button = ttk.Button(self.main_frame, text="Save", command=self.save_experiment,
+                                      style="Blue.TButton", width=6)
+        self.save_button.grid(row=5, column=1, pady=30)
+
+        self.run_button = ttk.Button(self.main_frame, text="Run", command=self.run_experiment,
+                                     style="Green.TButton", width=5)
+        self.run_button.grid(row=5, column=2, pady=30)
+
+        self.stop_button = ttk.Button(self.main_frame, text="Stop", command=self.stop_experiment,
+                                      style="Red.TButton", width=5)
+        self.stop_button.grid(row=5, column=2, pady=30)  # Takes the place of 'Run' during an experiment
+        self.stop_button.grid_remove()
+
+        self.reset_button = ttk.Button(self.main_frame, text="Clear all", command=self.reset_experiment,
+                                       style="Red.TButton", width=8)
+        self.reset_button.grid(row=5, column=3, pady=30)
+
+        self.time_var = tk.StringVar(value="Elapsed Time: 0 seconds")
+        self.time_label = tk.Label(self.main_frame, textvariable=self.time_var, font=self.font_14, bg="light blue")
+        self.time_label.grid(row=6, column=1, columnspan=3)
+        self.time_label.grid_remove()
+
+        self.tooltip = tk.Toplevel(self.root)
+        self.tooltip.wm_overrideredirect(True)
+        self.tooltip.configure(bg="white")
+        tk.Label(
+            self.tooltip,
+            text="Click to view LED intensity values (lux) recorded in real-time by the light sensor inside IllumiCell.",
+            bg="white",
+            fg="black",
+            font=self.font_11,
+            wraplength=250,
+            justify="left",
+            padx=10,
+            pady=5
+        ).pack()
+        self.tooltip.withdraw()
+        self.tooltip_shown = False
+
+        self.info_icon.bind("<Enter>", self.show_tooltip)
+        self.info_icon.bind("<Leave>", self.hide_tooltip)
+
+        self.update_queue_listbox()
+
+    # Connects to the Arduino in the background and shows the window. If the window is closed during an
+    # experiment, the experiment thread is stopped so that the program can exit.
+    def startup(self):
+        self.initialize_arduino()
+        self.root.after(50, self.show_arduino_errors)
+        self.root.mainloop()
+        if self.experiment_stopped is not None:
+            self.experiment_stopped.set()
+
+    # Function to display an initial instructions page for user to understand functionalities of the interface,
+    # including adding steps, saving experiments, and controlling the experiment (start/stop).
+    def show_instructions_overlay(self):
+        overlay_frame = tk.Frame(self.root, bg="#1E90FF", width=1350, height=700)
+        overlay_frame.place(relx=0.5, rely=0.59, anchor="center")
+
+        self.root.after(100, lambda: overlay_frame.lift())
+
+        instructions_label = tk.Label(overlay_frame, text="Welcome to IllumiCell!\n\n"
+                                                         "Instructions:\n\n"
+                                                         "1. Click 'Add Step' to create your experiment.\n"
+                                                         "2. Use 'Save' and 'Open saved files' to save and load experiments.\n"
+                                                         "3. Click 'Clear all' to reset the experiment queue.\n"
+                                                         "4. Click 'Run' to start the experiment.\n"
+                                                         "5. Click 'Stop' to halt a running experiment.\n"
+                                                         "6. Click 'View sensor data' for real-time sensor recordings during the experiment.\n"
+
+                                                         "\nClick 'OK' to continue.",
+                                 font=self.font_16, bg="#1E90FF", justify="center")
+        instructions_label.pack(padx = 50, pady=37)
+
+        ok_button = ttk.Button(overlay_frame, text="OK", command=overlay_frame.destroy,
+                               style="Blue.TButton", width=4)
+        ok_button.pack(pady=20)
+
+
+    # Function to initialize the connection to the Arduino board.
+    # This function starts the background thread that connects to the board and handles all communication with
+    # it, so that opening the port and waiting for the board to reset never hold up the interface.
+    def initialize_arduino(self):
+        threading.Thread(target=self.arduino_io_loop, daemon=True).start()
+
+
+    # Function that runs on a background thread for as long as the Arduino is connected, so that slow serial
+    # reads and writes never freeze the interface. It first opens the serial connection on COM8 with a baud rate
+    # of 115200 and waits 2 seconds for the board to reset; low latency mode is enabled where the serial driver
+    # supports it, so that commands reach the board without waiting on the USB poll interval. If the connection
+    # is unsuccessful, an error message is queued for show_arduino_errors to show to the user. Until the board
+    # is ready, self.arduino stays None, so send_to_arduino reports that it is not connected.
+    # Commands queued by send_to_arduino are collected into a single frame and written to the board in one go,
+    # and the most recent sensor readings received from the board are kept for the sensor data window to plot.
+    # Reads never wait on the port: only the bytes already received are read, and while there is nothing to do
+    # the thread waits up to 5ms for the next command instead. If the port fails (e.g. the board is unplugged),
+    # the error is reported once, the port is closed and the thread ends.
+    def arduino_io_loop(self):
         try:
-            arduino.write(command.encode())
+            arduino = serial.Serial('COM8', 115200, timeout=0, write_timeout=0.1)
+            try:
+                arduino.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, ValueError):
+                pass
+            time.sleep(2)
+        except serial.SerialException as e:
+            self.arduino_errors.put(f'Failed to connect to Arduino: {e}')
+            return
+        self.arduino = arduino
+
+        frame = bytearray()
+        sensor_reader = SensorReader(self.arduino, self.sensor_readings)
+
+        while self.arduino.is_open:
+            try:
+                frame += self.arduino_commands.get(timeout=0.005)
+                while True:
+                    frame += self.arduino_commands.get_nowait()
+            except Empty:
+                pass
+
+            try:
+                if frame:
+                    self.arduino.write(bytes(frame))
+            except Exception as e:
+                self.arduino_errors.put(f'Failed to send command to Arduino: {e}')
+            frame.clear()
+
+            try:
+                sensor_reader.read_available()
+            except serial.SerialException as e:
+                self.arduino_errors.put(f'Lost connection to Arduino: {e}')
+                self.arduino.close()
+                return
+            except Exception as e:
+                print(f"Error reading serial: {e}")
+
+
+    # Function to show any errors reported by the Arduino and experiment background threads. Tk widgets may only be
+    # used from the main thread, so the background threads queue their errors and this function collects them
+    # every 50ms.
+    def show_arduino_errors(self):
+        while True:
+            try:
+                error = self.arduino_errors.get_nowait()
+            except Empty:
+                break
+            messagebox.showerror('Error', error)
+        self.root.after(50, self.show_arduino_errors)
+
+
+    # Function to send a command to the connected Arduino board.
+    # This function checks if the Arduino connection is open, and if so, queues the given command to be sent
+    # by the background thread. If the connection is not open, an error message is shown. This function is also
+    # called from the experiment thread, so the error is queued for show_arduino_errors rather than shown here.
+    def send_to_arduino(self, command):
+        if self.arduino is not None and self.arduino.is_open:
+            self.arduino_commands.put(command.encode())
             print(f"Arduino is processing: {command.strip()}")
-        except Exception as e:
-            messagebox.showerror('Error', f'Failed to send command to Arduino: {e}')
-    else:
-        messagebox.showerror('Error', 'Arduino is not connected')
-
-
-# Function to add a step to the experiment queue.
-# This step represents a specific action or task within the experiment, such as turning on lights
-# or controlling the duration of the experiment. The function takes various parameters depending
-# on the type of step (e.g., light intensity, frequency, etc.) and appends it to the queue.
-def add_step_to_queue(step_type, duration, rate=None, on_time=None, off_time=None, lux=None):
-    step = [step_type, duration]
-    if rate is not None:
-        step.append(rate)
-    if on_time is not None and off_time is not None:
-        step.append(on_time)
-        step.append(off_time)
-    if lux is not None:
-        step.append(lux)
-    queue.append(step)
-    update_queue_listbox()
-
-
-# Function to update the contents of the queue listbox in the user interface.
-# This function refreshes the display to show the current experiment steps in the queue.
-# If no steps are added yet, a default message is shown. If steps are present, each one is
-# listed with relevant details such as light intensity or frequency.
-def update_queue_listbox():
-    queue_listbox.delete(0, 'end')
-
-    if not queue:
-        queue_listbox.insert(tk.END, 'Add a step to the experiment queue or open a previously saved file.')
-        queue_listbox.itemconfig(0, {'bg': 'lightgray'})
-        delete_button.grid_forget()
-    else:
-        for idx, step in enumerate(queue):
-            text = f"{idx + 1}: {step[0]} for {step[1]} seconds"
-
-            if step[0] == 'Continuous light' and len(step) >= 3:
-                text += f" at {step[2]} lux"
-
-            elif step[0] == 'Pulsing light' and len(step) >= 4:
-                text += f" - Frequency: {step[2]} Hz, Intensity: {step[3]} lux"
-
-            elif step[0] == 'Advanced pulsing light' and len(step) >= 5:
-                text += f" - On: {step[2]} ms, Off: {step[3]} ms, Intensity: {step[4]} lux"
-
-            queue_listbox.insert(tk.END, text)
-            queue_listbox.itemconfig(idx, {'bg': 'white'})
-
-
-# Function to highlight steps that are currently being processed in yellow, and steps that
-# are complete in green.
-def highlight_step(idx, color):
-    queue_listbox.itemconfig(idx, {'bg': color})
-
-
-# Function to reset the background colors of all steps in the queue listbox to their default color.
-# This is used to clear any highlights after selecting or processing steps.
-def reset_step_colors():
-    for idx in range(len(queue)):
-        queue_listbox.itemconfig(idx, {'bg': 'white'})
-
-
-# Function to update the time label in the interface during the experiment.
-# This continuously updates the elapsed time since the experiment started, and formats it into
-# hours, minutes, and seconds. It runs every second while the experiment is active.
-def update_time_label():
-    if experiment_running:
-        elapsed_time = time.time() - start_time
-        hours, remainder = divmod(int(elapsed_time), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        time_label.config(text=f"Elapsed time: {hours:02}:{minutes:02}:{seconds:02}")
-        global time_update_id
-        time_update_id = root.after(1000, update_time_label)
-
-
-# Function to hide the majority of buttons during the execution of an experiment.
-# This helps to declutter the interface by only displaying the 'Stop' button.
-def hide_buttons_except_stop():
-    add_step_button.place_forget()
-    open_button.place_forget()
-    save_button.place_forget()
-    reset_button.place_forget()
-    delete_button.place_forget()
-
-
-# Function to show the main control buttons after the experiment is complete.
-def show_buttons_after_experiment():
-    add_step_button.place(relx=0.42, rely=0.3, anchor="center")
-    open_button.place(relx=0.58, rely=0.3, anchor="center")
-    save_button.place(relx=0.35, rely=0.8, anchor="center")
-    reset_button.place(relx=0.65, rely=0.8, anchor="center")
-    delete_button.grid_forget()
-
-
-# Function to start and run the experiment.
-# This function processes each step in the experiment queue sequentially. It sends commands to the Arduino
-# for each step and updates the user interface. It also handles the timing for each step, switching
-# between different actions such as turning on lights or pulsing lights, and updates the elapsed time.
-def run_experiment():
-    global start_time, elapsed_time, experiment_running, scheduled_tasks
-
-    scheduled_tasks = []
-
-    if not queue:
-        messagebox.showwarning('No steps', 'Please add steps to the experiment first.')
-        return
-
-    try:
-        experiment_running = True
-
-        start_time = time.time()
-        elapsed_time = 0
-        total_duration = sum(step[1] for step in queue)
-
-        view_sensor_button.place(relx=0.5, rely=0.30, anchor="center")  # Show button
-        info_icon.place(relx=0.558, rely=0.30, anchor="center")
-
-        time_label.grid(row=6, column=0, columnspan=3, padx=570, pady=605)
-        update_time_label()
-
-        hide_buttons_except_stop()
+        else:
+            self.arduino_errors.put('Arduino is not connected')
+
+
+    # Function to add a step to the experiment queue.
+    # This step represents a specific action or task within the experiment, such as turning on lights
+    # or controlling the duration of the experiment. The function takes various parameters depending
+    # on the type of step (e.g., light intensity, frequency, etc.) and appends it to the queue.
+    def add_step_to_queue(self, step_type, duration, rate=None, on_time=None, off_time=None, lux=None):
+        step = Step(step_type, duration)
+        if rate is not None:
+            step.rate = rate
+        if on_time is not None and off_time is not None:
+            step.on_ms = on_time
+            step.off_ms = off_time
+        if lux is not None:
+            step.lux = lux
+        self.queue.append(step)
+        self.update_queue_listbox()
+
+
+    # Function to update the contents of the queue listbox in the user interface.
+    # This function refreshes the display to show the current experiment steps in the queue.
+    # If no steps are added yet, a default message is shown. If steps are present, each one is
+    # listed with relevant details such as light intensity or frequency. Only the rows that have
+    # changed since the last update are replaced: rows that match at the start and end of the list
+    # are left in place, and the rows between them are deleted and re-inserted in a single call each.
+    def update_queue_listbox(self):
+        self.reset_step_colors()
+
+        if not self.queue:
+            rows = ['Add a step to the experiment queue or open a previously saved file.']
+            self.delete_button.grid_remove()
+        else:
+            rows = [f"{idx + 1}: " + STEP_DESCRIPTIONS[step.kind].format(step) for idx, step in enumerate(self.queue)]
+
+        shortest = min(len(rows), len(self.listed_rows))
+        same_start = 0
+        while same_start < shortest and rows[same_start] == self.listed_rows[same_start]:
+            same_start += 1
+        same_end = 0
+        while same_end < shortest - same_start and rows[-1 - same_end] == self.listed_rows[-1 - same_end]:
+            same_end += 1
+
+        if same_start < len(self.listed_rows) - same_end:
+            self.queue_listbox.delete(same_start, len(self.listed_rows) - same_end - 1)
+        if same_start < len(rows) - same_end:
+            self.queue_listbox.insert(same_start, *rows[same_start:len(rows) - same_end])
+        self.listed_rows = rows
+
+        if not self.queue:
+            self.queue_listbox.itemconfig(0, {'bg': 'lightgray'})
+
+
+    # Function to highlight steps that are currently being processed in yellow, and steps that
+    # are complete in green.
+    def highlight_step(self, idx, color):
+        self.queue_listbox.itemconfig(idx, {'bg': color})
+        self.highlighted_steps.add(idx)
+
+
+    # Function to reset the background colors of highlighted steps in the queue listbox to their default color.
+    # This is used to clear any highlights after selecting or processing steps.
+    def reset_step_colors(self):
+        for idx in self.highlighted_steps:
+            self.queue_listbox.itemconfig(idx, {'bg': 'white'})
+        self.highlighted_steps.clear()
+
+
+    # Function to update the time label in the interface during the experiment.
+    # This continuously updates the elapsed time since the experiment started, and formats it into
+    # hours, minutes, and seconds. Elapsed time is measured on the monotonic clock, so changes to the
+    # computer's clock do not affect it. The clock is checked every 200ms, so the label turns over close to
+    # each second boundary, but the label is only changed (and redrawn) when the whole second has changed.
+    def update_time_label(self):
+        if self.experiment_running:
+            elapsed_time = (time.monotonic_ns() - self.start_ns) // 1_000_000_000
+            if elapsed_time != self.shown_elapsed_time:
+                self.shown_elapsed_time = elapsed_time
+                hours, remainder = divmod(elapsed_time, 3600)
+                minutes, seconds = divmod(remainder, 60)
+                self.time_var.set(f"Elapsed time: {hours:02}:{minutes:02}:{seconds:02}")
+            self.time_update_id = self.root.after(200, self.update_time_label)
+
+
+    # Function to hide the majority of buttons during the execution of an experiment.
+    # This helps to declutter the interface by only displaying the 'Stop' button in place of 'Run'.
+    def hide_buttons_except_stop(self):
+        self.run_button.grid_remove()
+        self.stop_button.grid()
+        self.add_step_button.grid_remove()
+        self.open_button.grid_remove()
+        self.save_button.grid_remove()
+        self.reset_button.grid_remove()
+        self.delete_button.grid_remove()
+
+
+    # Function to show the main control buttons after the experiment is complete.
+    def show_buttons_after_experiment(self):
+        self.stop_button.grid_remove()
+        self.run_button.grid()
+        self.add_step_button.grid()
+        self.open_button.grid()
+        self.save_button.grid()
+        self.reset_button.grid()
+        self.delete_button.grid_remove()
+
+
+    # Function to start and run the experiment.
+    # This function processes each step in the experiment queue sequentially. It sends commands to the Arduino
+    # for each step and updates the user interface. It also handles the timing for each step, switching
+    # between different actions such as turning on lights or pulsing lights, and updates the elapsed time.
+    # The steps are timed and sent from a background thread (see run_experiment_steps), so a busy interface,
+    # e.g. while the sensor graph is redrawn or a message box is open, never delays a step. The thread reports
+    # each step it starts through a queue, which show_experiment_progress reads every 50ms to update the list.
+    def run_experiment(self):
+
+        if not self.queue:
+            messagebox.showwarning('No steps', 'Please add steps to the experiment first.')
+            return
 
-        run_button.config(text="Stop", command=stop_experiment, bg="red")  # Change button to "Stop"
+        try:
+            self.experiment_running = True
 
-        def process_step(idx):
-            if idx >= len(queue):
-                send_to_arduino("OFF\n")
-                messagebox.showinfo('Experiment Finished', 'Experiment completed successfully!')
-                time_label.grid_forget()
-                reset_step_colors()
-                run_button.config(text="Run", command=run_experiment, bg="green")
-                show_buttons_after_experiment()
-                view_sensor_button.place_forget()
-                info_icon.place_forget()
-                global experiment_running
-                experiment_running = False
-                return
+            self.start_ns = time.monotonic_ns()
+            self.shown_elapsed_time = None
 
-            step = queue[idx]
-            highlight_step(idx, 'yellow')
-            root.update()
+            self.view_sensor_button.grid()  # Show button
+            self.info_icon.grid()
 
-            if step[0] == 'Continuous light':
-                duration = step[1]
-                lux = step[2]
-                send_to_arduino(f"ON {duration} {lux}\n")
+            self.time_label.grid()
+            self.update_time_label()
 
-            elif step[0] == 'No light':
-                duration = step[1]
-                send_to_arduino(f"OFF {duration}\n")
+            self.hide_buttons_except_stop()
 
-            elif step[0] == 'Pulsing light':
-                duration = step[1]
-                frequency = step[2]
-                lux = step[3]
-                send_to_arduino(f"PULSING {duration} {frequency} {lux}\n")
+            if self.experiment_runner is None:
+                self.experiment_runner = ThreadPoolExecutor(max_workers=1)
+            self.experiment_stopped = threading.Event()
+            progress = SimpleQueue()
+            self.experiment_runner.submit(self.run_experiment_steps, list(self.queue), self.start_ns,
+                                          self.experiment_stopped, progress)
+            self.root.after(50, self.show_experiment_progress, progress, self.experiment_stopped)
 
-            elif step[0] == 'Advanced pulsing light':
-                duration = step[1]
-                on_time = step[2]
-                off_time = step[3]
-                lux = step[4]
-                send_to_arduino(f"ADV_PULSING {duration} {on_time} {off_time} {lux}\n")
+        except Exception as e:
+            self.send_to_arduino("OFF\n")
+            self.show_buttons_after_experiment()
 
-            task_id = root.after(step[1] * 1000, highlight_step, idx, 'green')
-            scheduled_tasks.append(task_id)
 
-            task_id = root.after(step[1] * 1000, process_step, idx + 1)
-            scheduled_tasks.append(task_id)
+    # Function that runs on the experiment thread and sends the command for each step to the Arduino at its start
+    # time. Every step is timed against the experiment start time, rather than from the end of the previous step,
+    # so delays do not build up over long experiments. The thread waits on the 'stopped' event, so stopping the
+    # experiment wakes it straight away. The final "OFF" is sent from this thread as well, whether the experiment
+    # finished, was stopped or failed, so that it can never be overtaken by the command for a step. If a step
+    # cannot be run, the error is queued for show_arduino_errors and the interface is told the experiment failed.
+    def run_experiment_steps(self, steps, start_ns, stopped, progress):
+        try:
+            step_starts = itertools.accumulate((step.duration for step in steps), initial=0)
+            for idx, step_start in enumerate(step_starts):
+                delay = max(0, start_ns + step_start * 1_000_000_000 - time.monotonic_ns()) / 1e9
+                if stopped.wait(delay):
+                    break
+                if idx == len(steps):
+                    progress.put(('finished', idx))
+                    break
+                self.send_to_arduino(STEP_COMMANDS[steps[idx].kind].format(steps[idx]))
+                progress.put(('step', idx))
+        except Exception as e:
+            self.arduino_errors.put(f'Experiment stopped because a step could not be run: {e}')
+            progress.put(('failed', None))
+        finally:
+            self.send_to_arduino("OFF\n")
+
+
+    # Function to update the interface with the progress reported by the experiment thread: the step that has
+    # started is highlighted in yellow and the one before it in green, and once every step has run (or a step
+    # has failed) the interface is returned to its normal state. It stops checking once the experiment has
+    # finished, failed or been stopped.
+    def show_experiment_progress(self, progress, stopped):
+        while not stopped.is_set():
+            try:
+                update, idx = progress.get_nowait()
+            except Empty:
+                self.root.after(50, self.show_experiment_progress, progress, stopped)
+                return
 
-        process_step(0)
+            if update == 'step':
+                if idx > 0:
+                    self.highlight_step(idx - 1, 'green')
+                self.highlight_step(idx, 'yellow')
+            elif update == 'finished':
+                self.highlight_step(idx - 1, 'green')
+                stopped.set()
+                messagebox.showinfo('Experiment Finished', 'Experiment completed successfully!')
+                self.end_experiment()
+            else:
+                stopped.set()
+                self.end_experiment()
 
-    except Exception as e:
-        send_to_arduino("OFF\n")
-        run_button.config(text="Run", command=run_experiment, bg="green")
-        show_buttons_after_experiment()
 
+    # Function to return the interface to its normal state once the experiment has finished or been stopped.
+    def end_experiment(self):
+        if self.time_update_id is not None:
+            self.root.after_cancel(self.time_update_id)
+            self.time_update_id = None
+        self.reset_step_colors()
 
-# Function to stop the experiment by halting the commands being sent to the Arduino and updating the UI.
-def stop_experiment():
-    global experiment_running, scheduled_tasks
-    if not experiment_running:
-        return
+        self.experiment_running = False
+        self.show_buttons_after_experiment()
 
-    stop_confirm = messagebox.askyesno(
-        "Stop Experiment",
-        "Are you sure you want to stop the experiment?"
-    )
+        self.time_label.grid_remove()
+        self.view_sensor_button.grid_remove()
+        self.info_icon.grid_remove()
+        if self.sensor_data_window:
+            self.close_sensor_data_window()
 
-    if stop_confirm:
-        for task_id in scheduled_tasks:
-            root.after_cancel(task_id)
 
-        send_to_arduino("OFF\n")
-        reset_step_colors()
+    # Function to stop the experiment by halting the commands being sent to the Arduino and updating the UI.
+    def stop_experiment(self):
+        if not self.experiment_running:
+            return
 
-        experiment_running = False
-        run_button.config(text="Run", command=run_experiment, bg="green")
-        show_buttons_after_experiment()
+        stop_confirm = messagebox.askyesno(
+            "Stop Experiment",
+            "Are you sure you want to stop the experiment?"
+        )
 
-        time_label.grid_forget()
-        view_sensor_button.place_forget()
-        info_icon.place_forget()
-        if sensor_data_window:
-            close_sensor_data_window()
+        if stop_confirm:
+            self.experiment_stopped.set()  # The experiment thread sends "OFF" to the Arduino as it stops
+            self.end_experiment()
 
-    else:
-        return
+        else:
+            return
 
 
-# Function to save the current experiment as a JSON file in the user's personal desktop library location of choice.
-def save_experiment():
-    if not queue:
-        messagebox.showwarning('Error', 'Please add steps to the experiment first.')
-        return
+    # Function to save the current experiment as a JSON file in the user's personal desktop library location of choice.
+    def save_experiment(self):
+        if not self.queue:
+            messagebox.showwarning('Error', 'Please add steps to the experiment first.')
+            return
 
-    file_path = filedialog.asksaveasfilename(
-        defaultextension=".json",
-        filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")],
-        title="Save Experiment"
-    )
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")],
+            title="Save Experiment"
+        )
+
+        if file_path:
+            try:
+                with open(file_path, 'w') as file:
+                    json.dump([asdict(step) for step in self.queue], file, separators=(',', ':'))
+                messagebox.showinfo('Success', f'Experiment saved successfully to {file_path}')
+            except Exception as e:
+                messagebox.showerror('Error', f'Failed to save experiment: {e}')
+
+
+    # Function to open and load a saved experiment file, updating the queue list in the interface.
+    # The file is read and parsed in a separate process so that large experiments do not freeze the interface,
+    # and the queue is updated once parsing has finished. If that process has stopped working, it is replaced
+    # the next time a file is opened. The most recently opened files are remembered
+    # together with the time they were last modified, so reopening a file that has not changed since
+    # skips reading and parsing it again.
+    def open_experiment(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")],
+            title="Open Experiment"
+        )
+
+        if file_path:
+            try:
+                opened_file = (file_path, os.stat(file_path).st_mtime_ns)
+                if opened_file in self.opened_experiments:
+                    self.opened_experiments.move_to_end(opened_file)
+                    self.add_opened_experiment(self.opened_experiments[opened_file])
+                    return
+
+                if self.experiment_loader is None:
+                    self.experiment_loader = ProcessPoolExecutor(max_workers=1)
+                parsed_file = self.experiment_loader.submit(load_experiment_file, file_path)
+                self.root.after(50, self.finish_opening_experiment, parsed_file, opened_file)
+            except BrokenProcessPool as e:
+                self.experiment_loader = None
+                messagebox.showerror('Error', f'Failed to open experiment: {e}')
+            except Exception as e:
+                messagebox.showerror('Error', f'Failed to open experiment: {e}')
+
+
+    # Function to remember an opened experiment file once it has been parsed and add its steps to the queue.
+    # Until parsing has finished, it checks again every 50ms.
+    def finish_opening_experiment(self, parsed_file, opened_file):
+        if not parsed_file.done():
+            self.root.after(50, self.finish_opening_experiment, parsed_file, opened_file)
+            return
 
-    if file_path:
         try:
-            with open(file_path, 'w') as file:
-                json.dump(queue, file, indent=4)
-            messagebox.showinfo('Success', f'Experiment saved successfully to {file_path}')
+            saved_steps = parsed_file.result()
+        except BrokenProcessPool as e:
+            self.experiment_loader = None
+            messagebox.showerror('Error', f'Failed to open experiment: {e}')
+            return
         except Exception as e:
-            messagebox.showerror('Error', f'Failed to save experiment: {e}')
+            messagebox.showerror('Error', f'Failed to open experiment: {e}')
+            return
 
+        self.opened_experiments[opened_file] = saved_steps
+        if len(self.opened_experiments) > OPENED_EXPERIMENTS_KEPT:
+            self.opened_experiments.popitem(last=False)
+        self.add_opened_experiment(saved_steps)
 
-# Function to open and load a saved experiment file, updating the queue list in the interface.
-def open_experiment():
-    file_path = filedialog.askopenfilename(
-        filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")],
-        title="Open Experiment"
-    )
 
-    if file_path:
+    # Function to add the steps of an opened experiment file to the queue.
+    def add_opened_experiment(self, saved_steps):
         try:
-            with open(file_path, 'r') as file:
-                loaded_queue = json.load(file)
+            loaded_queue = [Step.from_saved(saved) for saved in saved_steps]
 
-            queue.extend(loaded_queue)
-            update_queue_listbox()
+            self.queue.extend(loaded_queue)
+            self.update_queue_listbox()
 
             messagebox.showinfo('Success', 'Experiment loaded successfully')
         except Exception as e:
             messagebox.showerror('Error', f'Failed to open experiment: {e}')
 
 
-# Function to reset the experiment queue.
-def reset_experiment():
-    global queue
-    queue = []
-    update_queue_listbox()
+    # Function to reset the experiment queue.
+    def reset_experiment(self):
+        self.queue = []
+        self.update_queue_listbox()
 
 
-# Function to delete a selected step from the experiment queue.
-def delete_step():
-    selected_index = queue_listbox.curselection()
+    # Function to delete a selected step from the experiment queue.
+    def delete_step(self):
+        selected_index = self.queue_listbox.curselection()
 
-    if selected_index:
-        idx = selected_index[0]
+        if selected_index:
+            idx = selected_index[0]
 
-        if idx == 0 and not queue:
-            messagebox.showwarning("Cannot Delete", "The default text cannot be deleted.")
-            return
+            if idx == 0 and not self.queue:
+                messagebox.showwarning("Cannot Delete", "The default text cannot be deleted.")
+                return
 
-        confirm = messagebox.askyesno("Confirm Deletion", "Are you sure you want to delete this step?")
-        if confirm:
-            queue.pop(idx)
-            update_queue_listbox()
-            delete_button.grid_forget()
-    else:
-        messagebox.showwarning('No Selection', 'Please select a step to delete.')
-
-
-# Function to handle a click on a step in the queue list.
-# This function updates the UI to display the delete button when a step is selected, allowing the user to delete it.
-def on_step_click(event):
-    if experiment_running:
-        return
-    selected_index = queue_listbox.curselection()
-
-    if selected_index:
-        if selected_index[0] == 0 and not queue:
-            delete_button.grid_forget()
+            confirm = messagebox.askyesno("Confirm Deletion", "Are you sure you want to delete this step?")
+            if confirm:
+                self.queue.pop(idx)
+                self.update_queue_listbox()
+                self.delete_button.grid_remove()
         else:
-            delete_button.grid(row=6, column=0, columnspan=3, pady=260, padx=875)
-    else:
-        delete_button.grid_forget()
-
-
-# Function to hide the delete button when clicking outside the button.
-# This function ensures that the delete button is hidden if the user clicks anywhere outside it.
-def on_click_outside(event):
-    if event.widget != delete_button:
-        delete_button.grid_forget()
+            messagebox.showwarning('No Selection', 'Please select a step to delete.')
 
 
-# Opens a new window to add a step to the experiment.
-# Allows the user to select a type of step (Continuous light, Pulsing light, No light)
-# and enter relevant parameters for that step (e.g., duration, pulse rate, light intensity).
-def open_add_step_window():
-    add_step_window = tk.Toplevel(root)
-    add_step_window.title("Add Step to Experiment")
-    add_step_window.geometry("500x470")
-    add_step_window.configure(bg="light blue")
-
-    hours_var = tk.IntVar(value=0)
-    minutes_var = tk.IntVar(value=0)
-    seconds_var = tk.IntVar(value=0)
-
-    on_time_var = tk.IntVar()
-    off_time_var = tk.IntVar()
-    pulse_rate_var = tk.IntVar()
-
-    def show_step_selection():
-        for widget in add_step_window.winfo_children():
-            widget.destroy()
-
-        add_step_window.title("Add Step to Experiment")
-
-        tk.Label(add_step_window, text="Which type of step would you like to add?",
-                 font=("Helvetica", 16), bg="light blue", fg="black").pack(pady=40)
-
-        tk.Button(add_step_window, text="Continuous light", command=lambda: select_step("Continuous light"),
-                  bg="blue", fg="white", font=("Helvetica", 14), width=20).pack(pady=20)
-        tk.Button(add_step_window, text="Pulsing light", command=lambda: select_step("Pulsing light"),
-                  bg="blue", fg="white", font=("Helvetica", 14), width=20).pack(pady=20)
-        tk.Button(add_step_window, text="No light", command=lambda: select_step("No light"),
-                  bg="blue", fg="white", font=("Helvetica", 14), width=20).pack(pady=20)
-
-    def get_total_duration(h_var=None, m_var=None, s_var=None):
-        h = h_var.get() if h_var else hours_var.get()
-        m = m_var.get() if m_var else minutes_var.get()
-        s = s_var.get() if s_var else seconds_var.get()
-        return (h * 3600) + (m * 60) + s
-
-    def validate_and_add_step(callback,
-                              h_var=None, m_var=None, s_var=None,
-                              pulse_rate_var=None,
-                              on_time_var=None,
-                              off_time_var=None):
-        if get_total_duration(h_var, m_var, s_var) == 0:
-            messagebox.showwarning("Invalid input", "Duration cannot be 0. Please enter a valid time.")
-            add_step_window.lift()
-            add_step_window.focus_force()
+    # Function to handle a click on a step in the queue list.
+    # This function updates the UI to display the delete button when a step is selected, allowing the user to delete it.
+    def on_step_click(self, event):
+        if self.experiment_running:
             return
+        selected_index = self.queue_listbox.curselection()
 
-        if pulse_rate_var is not None and pulse_rate_var.get() == 0:
-            messagebox.showwarning("Invalid input", "Pulse rate cannot be 0. Please enter a valid pulse rate.")
-            add_step_window.lift()
-            add_step_window.focus_force()
-            return
+        if selected_index:
+            if selected_index[0] == 0 and not self.queue:
+                self.delete_button.grid_remove()
+            else:
+                self.delete_button.grid()
+        else:
+            self.delete_button.grid_remove()
 
-        if on_time_var is not None and on_time_var.get() == 0:
-            messagebox.showwarning("Invalid input", "Time on (ms) cannot be 0. Please enter a valid value.")
-            add_step_window.lift()
-            add_step_window.focus_force()
-            return
 
-        if off_time_var is not None and off_time_var.get() == 0:
-            messagebox.showwarning("Invalid input", "Time off (ms) cannot be 0. Please enter a valid value.")
-            add_step_window.lift()
-            add_step_window.focus_force()
+    # Function to hide the delete button when clicking outside the button.
+    # This function ensures that the delete button is hidden if the user clicks anywhere outside it.
+    # Clicks on the delete button itself, and on the queue list (where on_step_click decides whether the
+    # button is shown), are ignored with a single set lookup.
+    def on_click_outside(self, event):
+        if id(event.widget) in self.click_inside_widgets:
             return
+        self.delete_button.grid_remove()
 
-        callback()
-        add_step_window.destroy()
-
-    def select_step(step_type):
-        for widget in add_step_window.winfo_children():
-            widget.destroy()
 
-        add_step_window.title(step_type)
-
-        tk.Label(add_step_window, text=f"{step_type} duration:",
-                 font=("Helvetica", 16), bg="light blue", fg="black").pack(pady=10)
-
-        def validate_input(value):
-            return value.isdigit() or value == ""
+    # Opens a new window to add a step to the experiment.
+    # Allows the user to select a type of step (Continuous light, Pulsing light, No light)
+    # and enter relevant parameters for that step (e.g., duration, pulse rate, light intensity).
+    def open_add_step_window(self):
+        add_step_window = tk.Toplevel(self.root)
+        add_step_window.title("Add Step to Experiment")
+        add_step_window.geometry("500x470")
+        add_step_window.configure(bg="light blue")
+
+        hours_var = tk.IntVar(value=0)
+        minutes_var = tk.IntVar(value=0)
+        seconds_var = tk.IntVar(value=0)
+
+        on_time_var = tk.IntVar()
+        off_time_var = tk.IntVar()
+        pulse_rate_var = tk.IntVar()
+
+        def show_step_selection():
+            for widget in add_step_window.winfo_children():
+                widget.destroy()
+
+            add_step_window.title("Add Step to Experiment")
+
+            tk.Label(add_step_window, text="Which type of step would you like to add?",
+                     font=self.font_16, bg="light blue", fg="black").pack(pady=40)
+
+            ttk.Button(add_step_window, text="Continuous light", command=lambda: select_step("Continuous light"),
+                       style="Blue.TButton", width=20).pack(pady=20)
+            ttk.Button(add_step_window, text="Pulsing light", command=lambda: select_step("Pulsing light"),
+                       style="Blue.TButton", width=20).pack(pady=20)
+            ttk.Button(add_step_window, text="No light", command=lambda: select_step("No light"),
+                       style="Blue.TButton", width=20).pack(pady=20)
+
+        # Builds the row of hours, minutes and seconds entry fields, each followed by its unit label.
+        def build_duration_fields(frame, duration_vars, **entry_options):
+            for column, (var, unit) in enumerate(zip(duration_vars, "hms")):
+                tk.Entry(frame, textvariable=var, width=5, **entry_options).grid(row=0, column=column * 2, padx=5)
+                tk.Label(frame, text=unit, font=self.font_14, bg="light blue").grid(row=0, column=column * 2 + 1, padx=5)
+
+        def get_total_duration(h_var=None, m_var=None, s_var=None):
+            h = h_var.get() if h_var else hours_var.get()
+            m = m_var.get() if m_var else minutes_var.get()
+            s = s_var.get() if s_var else seconds_var.get()
+            return (h * 3600) + (m * 60) + s
+
+        def validate_and_add_step(callback,
+                                  h_var=None, m_var=None, s_var=None,
+                                  pulse_rate_var=None,
+                                  on_time_var=None,
+                                  off_time_var=None):
+            if get_total_duration(h_var, m_var, s_var) == 0:
+                messagebox.showwarning("Invalid input", "Duration cannot be 0. Please enter a valid time.")
+                add_step_window.lift()
+                add_step_window.focus_force()
+                return
 
-        validate_cmd = add_step_window.register(validate_input)
+            if pulse_rate_var is not None and pulse_rate_var.get() == 0:
+                messagebox.showwarning("Invalid input", "Pulse rate cannot be 0. Please enter a valid pulse rate.")
+                add_step_window.lift()
+                add_step_window.focus_force()
+                return
 
-        duration_frame = tk.Frame(add_step_window, bg="light blue")
-        duration_frame.pack(pady=5)
+            if on_time_var is not None and on_time_var.get() == 0:
+                messagebox.showwarning("Invalid input", "Time on (ms) cannot be 0. Please enter a valid value.")
+                add_step_window.lift()
+                add_step_window.focus_force()
+                return
 
-        tk.Entry(duration_frame, textvariable=hours_var, width=5, validate="key",
-                 validatecommand=(validate_cmd, "%P")).grid(row=0, column=0, padx=5)
-        tk.Label(duration_frame, text="h", font=("Helvetica", 14), bg="light blue").grid(row=0, column=1, padx=5)
+            if off_time_var is not None and off_time_var.get() == 0:
+                messagebox.showwarning("Invalid input", "Time off (ms) cannot be 0. Please enter a valid value.")
+                add_step_window.lift()
+                add_step_window.focus_force()
+                return
 
-        tk.Entry(duration_frame, textvariable=minutes_var, width=5, validate="key",
-                 validatecommand=(validate_cmd, "%P")).grid(row=0, column=2, padx=5)
-        tk.Label(duration_frame, text="m", font=("Helvetica", 14), bg="light blue").grid(row=0, column=3, padx=5)
+            callback()
+            add_step_window.destroy()
 
-        tk.Entry(duration_frame, textvariable=seconds_var, width=5, validate="key",
-                 validatecommand=(validate_cmd, "%P")).grid(row=0, column=4, padx=5)
-        tk.Label(duration_frame, text="s", font=("Helvetica", 14), bg="light blue").grid(row=0, column=5, padx=5)
+        def select_step(step_type):
+            for widget in add_step_window.winfo_children():
+                widget.destroy()
 
-        if step_type == "Pulsing light":
-            tk.Label(add_step_window, text="Pulse rate (Hz):", font=("Helvetica", 14), bg="light blue",
-                     fg="black").pack(pady=5)
-            tk.Entry(add_step_window, textvariable=pulse_rate_var, width=10, validate="key",
-                     validatecommand=(validate_cmd, "%P")).pack(pady=5)
+            add_step_window.title(step_type)
 
-            tk.Label(add_step_window, text="Light intensity (lux):", font=("Helvetica", 14), bg="light blue",
-                     fg="black").pack(pady=10)
+            tk.Label(add_step_window, text=f"{step_type} duration:",
+                     font=self.font_16, bg="light blue", fg="black").pack(pady=10)
 
-            intensity_slider = tk.Scale(add_step_window, from_=0, to=100, orient="horizontal", length=300,
-                                        tickinterval=20,
-                                        sliderlength=20, font=("Helvetica", 12), bg="light blue", fg="black")
-            intensity_slider.set(50)
-            intensity_slider.pack(pady=10)
+            def validate_input(value):
+                return DIGITS_ONLY(value) is not None
 
-            def open_advanced_settings():
-                for widget in add_step_window.winfo_children():
-                    widget.destroy()
+            validate_cmd = add_step_window.register(validate_input)
 
-                add_step_window.title("Advanced Settings")
+            duration_frame = tk.Frame(add_step_window, bg="light blue")
+            duration_frame.pack(pady=5)
+            build_duration_fields(duration_frame, (hours_var, minutes_var, seconds_var),
+                                  validate="key", validatecommand=(validate_cmd, "%P"))
 
-                tk.Label(add_step_window, text="Advanced pulsing light duration:", font=("Helvetica", 14),
-                         bg="light blue").pack(pady=10)
-                advanced_hours_var = tk.IntVar(value=hours_var.get())
-                advanced_minutes_var = tk.IntVar(value=minutes_var.get())
-                advanced_seconds_var = tk.IntVar(value=seconds_var.get())
+            if step_type == "Pulsing light":
+                tk.Label(add_step_window, text="Pulse rate (Hz):", font=self.font_14, bg="light blue",
+                         fg="black").pack(pady=5)
+                tk.Entry(add_step_window, textvariable=pulse_rate_var, width=10, validate="key",
+                         validatecommand=(validate_cmd, "%P")).pack(pady=5)
 
-                advanced_duration_frame = tk.Frame(add_step_window, bg="light blue")
-                advanced_duration_frame.pack(pady=5)
+                tk.Label(add_step_window, text="Light intensity (lux):", font=self.font_14, bg="light blue",
+                         fg="black").pack(pady=10)
 
-                tk.Entry(advanced_duration_frame, textvariable=advanced_hours_var, width=5).grid(row=0, column=0,
-                                                                                                 padx=5)
-                tk.Label(advanced_duration_frame, text="h", font=("Helvetica", 14), bg="light blue").grid(row=0,
-                                                                                                          column=1,
-                                                                                                          padx=5)
+                intensity_slider = tk.Scale(add_step_window, from_=0, to=100, orient="horizontal", length=300,
+                                            tickinterval=20,
+                                            sliderlength=20, font=self.font_12, bg="light blue", fg="black")
+                intensity_slider.set(50)
+                intensity_slider.pack(pady=10)
 
-                tk.Entry(advanced_duration_frame, textvariable=advanced_minutes_var, width=5).grid(row=0, column=2,
-                                                                                                   padx=5)
-                tk.Label(advanced_duration_frame, text="m", font=("Helvetica", 14), bg="light blue").grid(row=0,
-                                                                                                          column=3,
-                                                                                                          padx=5)
+                def open_advanced_settings():
+                    for widget in add_step_window.winfo_children():
+                        widget.destroy()
+
+                    add_step_window.title("Advanced Settings")
+
+                    tk.Label(add_step_window, text="Advanced pulsing light duration:", font=self.font_14,
+                             bg="light blue").pack(pady=10)
+                    advanced_hours_var = tk.IntVar(value=hours_var.get())
+                    advanced_minutes_var = tk.IntVar(value=minutes_var.get())
+                    advanced_seconds_var = tk.IntVar(value=seconds_var.get())
+
+                    advanced_duration_frame = tk.Frame(add_step_window, bg="light blue")
+                    advanced_duration_frame.pack(pady=5)
+                    build_duration_fields(advanced_duration_frame,
+                                          (advanced_hours_var, advanced_minutes_var, advanced_seconds_var))
+
+                    tk.Label(add_step_window, text="Time a single pulse is on (ms):", font=self.font_14,
+                             bg="light blue").pack(pady=10)
+                    advanced_on_time_var = tk.IntVar(value=on_time_var.get())
+                    tk.Entry(add_step_window, textvariable=advanced_on_time_var, width=10).pack(pady=5)
+
+                    tk.Label(add_step_window, text="Time between pulses (ms):", font=self.font_14,
+                             bg="light blue").pack(pady=10)
+                    advanced_off_time_var = tk.IntVar(value=off_time_var.get())
+                    tk.Entry(add_step_window, textvariable=advanced_off_time_var, width=10).pack(pady=5)
+
+                    tk.Label(add_step_window, text="Light intensity (lux):", font=self.font_14, bg="light blue",
+                             fg="black").pack(pady=10)
+                    intensity_slider = tk.Scale(add_step_window, from_=0, to=100, orient="horizontal", length=300,
+                                                tickinterval=20, sliderlength=20, font=self.font_12, bg="light blue",
+                                                fg="black")
+                    intensity_slider.set(50)
+                    intensity_slider.pack(pady=10)
+
+                    def add_advanced_pulsing_step():
+                        self.add_step_to_queue("Advanced pulsing light",
+                                               get_total_duration(advanced_hours_var, advanced_minutes_var,
+                                                                  advanced_seconds_var),
+                                               on_time=advanced_on_time_var.get(),
+                                               off_time=advanced_off_time_var.get(),
+                                               lux=intensity_slider.get())
+
+                    btn_frame = tk.Frame(add_step_window, bg="light blue")
+                    btn_frame.pack(pady=20)
+
+                    ttk.Button(btn_frame, text="Add Step to Queue",
+                               command=lambda: validate_and_add_step(add_advanced_pulsing_step,
+                                                                     h_var=advanced_hours_var,
+                                                                     m_var=advanced_minutes_var,
+                                                                     s_var=advanced_seconds_var,
+                                                                     on_time_var=advanced_on_time_var,
+                                                                     off_time_var=advanced_off_time_var),
+                               style="Blue.TButton", width=16).grid(row=0, column=1, padx=10)
+
+                    ttk.Button(btn_frame, text="Back", command=lambda: select_step("Pulsing light"), style="Red.TButton",
+                               width=6).grid(row=0, column=0, padx=10)
+
+                ttk.Button(add_step_window, text="Advanced Settings", command=open_advanced_settings, style="Blue.TButton",
+                           width=16).pack(pady=10)
+
+                def add_pulsing_step():
+                    light_intensity = intensity_slider.get()
+                    self.add_step_to_queue(step_type, get_total_duration(), pulse_rate_var.get(), lux=light_intensity)
 
-                tk.Entry(advanced_duration_frame, textvariable=advanced_seconds_var, width=5).grid(row=0, column=4,
-                                                                                                   padx=5)
-                tk.Label(advanced_duration_frame, text="s", font=("Helvetica", 14), bg="light blue").grid(row=0,
-                                                                                                          column=5,
-                                                                                                          padx=5)
+                btn_frame = tk.Frame(add_step_window, bg="light blue")
+                btn_frame.pack(pady=20)
 
-                tk.Label(add_step_window, text="Time a single pulse is on (ms):", font=("Helvetica", 14),
-                         bg="light blue").pack(pady=10)
-                advanced_on_time_var = tk.IntVar(value=on_time_var.get())
-                tk.Entry(add_step_window, textvariable=advanced_on_time_var, width=10).pack(pady=5)
+                ttk.Button(btn_frame, text="Add Step to Queue",
+                           command=lambda: validate_and_add_step(add_pulsing_step,
+                                                                 pulse_rate_var=pulse_rate_var),
+                           style="Blue.TButton", width=16).grid(row=0, column=1, padx=10)
 
-                tk.Label(add_step_window, text="Time between pulses (ms):", font=("Helvetica", 14),
-                         bg="light blue").pack(pady=10)
-                advanced_off_time_var = tk.IntVar(value=off_time_var.get())
-                tk.Entry(add_step_window, textvariable=advanced_off_time_var, width=10).pack(pady=5)
+                ttk.Button(btn_frame, text="Back", command=show_step_selection, style="Red.TButton",
+                           width=6).grid(row=0, column=0, padx=10)
 
-                tk.Label(add_step_window, text="Light intensity (lux):", font=("Helvetica", 14), bg="light blue",
+            elif step_type == "Continuous light":
+                tk.Label(add_step_window, text="Light intensity (lux):", font=self.font_14, bg="light blue",
                          fg="black").pack(pady=10)
                 intensity_slider = tk.Scale(add_step_window, from_=0, to=100, orient="horizontal", length=300,
-                                            tickinterval=20, sliderlength=20, font=("Helvetica", 12), bg="light blue",
+                                            tickinterval=20, sliderlength=20, font=self.font_12, bg="light blue",
                                             fg="black")
                 intensity_slider.set(50)
                 intensity_slider.pack(pady=10)
 
-                def add_advanced_pulsing_step():
-                    add_step_to_queue("Advanced pulsing light",
-                                      get_total_duration(advanced_hours_var, advanced_minutes_var,
-                                                         advanced_seconds_var),
-                                      on_time=advanced_on_time_var.get(),
-                                      off_time=advanced_off_time_var.get(),
-                                      lux=intensity_slider.get())
+                def add_continuous_light_step():
+                    light_intensity = intensity_slider.get()
+                    self.add_step_to_queue(step_type, get_total_duration(), lux=light_intensity)
 
                 btn_frame = tk.Frame(add_step_window, bg="light blue")
                 btn_frame.pack(pady=20)
 
-                tk.Button(btn_frame, text="Add Step to Queue",
-                          command=lambda: validate_and_add_step(add_advanced_pulsing_step,
-                                                                h_var=advanced_hours_var,
-                                                                m_var=advanced_minutes_var,
-                                                                s_var=advanced_seconds_var,
-                                                                on_time_var=advanced_on_time_var,
-                                                                off_time_var=advanced_off_time_var),
-                          bg="blue", fg="white", font=("Helvetica", 14), width=16).grid(row=0, column=1, padx=10)
-
-                tk.Button(btn_frame, text="Back", command=lambda: select_step("Pulsing light"), bg="red", fg="white",
-                          font=("Helvetica", 14), width=6).grid(row=0, column=0, padx=10)
-
-            tk.Button(add_step_window, text="Advanced Settings", command=open_advanced_settings, bg="blue", fg="white",
-                      font=("Helvetica", 14), width=16).pack(pady=10)
-
-            def add_pulsing_step():
-                light_intensity = intensity_slider.get()
-                add_step_to_queue(step_type, get_total_duration(), pulse_rate_var.get(), lux=light_intensity)
-
-            btn_frame = tk.Frame(add_step_window, bg="light blue")
-            btn_frame.pack(pady=20)
-
-            tk.Button(btn_frame, text="Add Step to Queue",
-                      command=lambda: validate_and_add_step(add_pulsing_step,
-                                                            pulse_rate_var=pulse_rate_var),
-                      bg="blue", fg="white", font=("Helvetica", 14), width=16).grid(row=0, column=1, padx=10)
-
-            tk.Button(btn_frame, text="Back", command=show_step_selection, bg="red", fg="white",
-                      font=("Helvetica", 14), width=6).grid(row=0, column=0, padx=10)
-
-        elif step_type == "Continuous light":
-            tk.Label(add_step_window, text="Light intensity (lux):", font=("Helvetica", 14), bg="light blue",
-                     fg="black").pack(pady=10)
-            intensity_slider = tk.Scale(add_step_window, from_=0, to=100, orient="horizontal", length=300,
-                                        tickinterval=20, sliderlength=20, font=("Helvetica", 12), bg="light blue",
-                                        fg="black")
-            intensity_slider.set(50)
-            intensity_slider.pack(pady=10)
-
-            def add_continuous_light_step():
-                light_intensity = intensity_slider.get()
-                add_step_to_queue(step_type, get_total_duration(), lux=light_intensity)
-
-            btn_frame = tk.Frame(add_step_window, bg="light blue")
-            btn_frame.pack(pady=20)
+                ttk.Button(btn_frame, text="Add Step to Queue",
+                           command=lambda: validate_and_add_step(add_continuous_light_step),
+                           style="Blue.TButton", width=16).grid(row=0, column=1, padx=10)
 
-            tk.Button(btn_frame, text="Add Step to Queue",
-                      command=lambda: validate_and_add_step(add_continuous_light_step),
-                      bg="blue", fg="white", font=("Helvetica", 14), width=16).grid(row=0, column=1, padx=10)
+                ttk.Button(btn_frame, text="Back", command=show_step_selection, style="Red.TButton",
+                           width=6).grid(row=0, column=0, padx=10)
 
-            tk.Button(btn_frame, text="Back", command=show_step_selection, bg="red", fg="white",
-                      font=("Helvetica", 14), width=6).grid(row=0, column=0, padx=10)
+            else:
+                def add_no_light_step():
+                    self.add_step_to_queue(step_type, get_total_duration())
 
-        else:
-            def add_no_light_step():
-                add_step_to_queue(step_type, get_total_duration())
-
-            btn_frame = tk.Frame(add_step_window, bg="light blue")
-            btn_frame.pack(pady=20)
-
-            tk.Button(btn_frame, text="Add Step to Queue",
-                      command=lambda: validate_and_add_step(add_no_light_step),
-                      bg="blue", fg="white", font=("Helvetica", 14), width=16).grid(row=0, column=1, padx=10)
-
-            tk.Button(btn_frame, text="Back", command=show_step_selection, bg="red", fg="white",
-                      font=("Helvetica", 14), width=6).grid(row=0, column=0, padx=10)
-
-    show_step_selection()
-
-
-# This function receives real-time sensor data from the Arduino and plots
-# a graph with the data while updating every 500ms until the experiment finishes.
-def open_sensor_data_window():
-    global sensor_data_window, sensor_values, time_counter, times, line, canvas, ax
-
-    if sensor_data_window is not None and tk.Toplevel.winfo_exists(sensor_data_window):
-        return
-
-    sensor_data_window = tk.Toplevel(root)
-    sensor_data_window.title("Sensor Data")
-    sensor_data_window.geometry("600x400")
-
-    sensor_values.clear()
-    times.clear()
-    time_counter = 0
-
-    fig = Figure(figsize=(6, 4))
-    ax = fig.add_subplot(111)
-    ax.set_title("Real-time Sensor Data")
-    ax.set_xlabel("Time (s)")
-    ax.set_ylabel("LED Intensity (lux)")
-
-    line, = ax.plot([], [], "b-")
+                btn_frame = tk.Frame(add_step_window, bg="light blue")
+                btn_frame.pack(pady=20)
 
-    canvas = FigureCanvasTkAgg(fig, master=sensor_data_window)
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+                ttk.Button(btn_frame, text="Add Step to Queue",
+                           command=lambda: validate_and_add_step(add_no_light_step),
+                           style="Blue.TButton", width=16).grid(row=0, column=1, padx=10)
 
-    def update_graph():
-        global time_counter
+                ttk.Button(btn_frame, text="Back", command=show_step_selection, style="Red.TButton",
+                           width=6).grid(row=0, column=0, padx=10)
 
-        if experiment_running and arduino is not None:
-            if arduino.in_waiting > 0:
-                try:
-                    sensor_value = arduino.readline().decode('utf-8').strip()
-                    print(f"Received: {sensor_value}")
+        show_step_selection()
 
-                    if sensor_value.replace(".", "", 1).isdigit():
-                        sensor_value = float(sensor_value)
-                        sensor_values.append(sensor_value)
-                        times.append(time_counter)
-                        time_counter += 1
 
-                        line.set_xdata(times)
-                        line.set_ydata(sensor_values)
-                        ax.relim()
-                        ax.autoscale_view()
-                        canvas.draw()
+    # This function plots the real-time sensor data received from the Arduino as a graph of the most recent
+    # readings against the time since the experiment started, updating every 100ms until the experiment finishes.
+    # The serial thread keeps only the latest timestamped readings, and on each update the saved background of
+    # the axes is restored and only the plotted line is drawn over it, so the cost per update does not grow with
+    # the length of the experiment. The whole graph is only redrawn when the newest reading reaches the right
+    # edge and the time axis has to move on. All readings received between two updates are drawn together, and
+    # an update with no new readings draws nothing. While the window is minimised or hidden, readings are still
+    # collected but nothing is redrawn. Matplotlib is only imported, and the window and graph only built, the
+    # first time the window is opened; after that the same window is shown again with an empty graph.
+    def open_sensor_data_window(self):
 
-                except Exception as e:
-                    print(f"Error reading serial: {e}")
+        if self.sensor_update_id is not None:
+            return
 
-            sensor_data_window.after(500, update_graph)
+        if self.sensor_data_window is None:
+            self.start_sensor_graph = self.build_sensor_data_window()
         else:
-            sensor_data_window.destroy()
-
-    update_graph()
-    sensor_data_window.protocol("WM_DELETE_WINDOW", lambda: close_sensor_data_window())
-
-
-# This function closes the sensor data window and stops data collection.
-# It is triggered when the window's close button is clicked.
-def close_sensor_data_window():
-    global sensor_data_window
-    sensor_data_window.destroy()
-    sensor_data_window = None
-
-
-# This section sets up the main IllumiCell GUI window, configuring its title, size, and background.
-root = tk.Tk()
-root.title("IllumiCell")
-root.geometry("1350x700")
-root.configure(bg="light blue")
-
-show_instructions_overlay()
-
-
-title_label = tk.Label(root, text="IllumiCell", font=("Helvetica", 30, "bold"), bg="light blue")
-title_label.place(relx=0.5, rely=0.09, anchor="center")  # Centered horizontally
-
-description_label = tk.Label(root,
-                             text="Device that administers light to study the effects of in vitro activation of skin cell opsins",
-                             font=("Helvetica", 16), bg="light blue", wraplength=650)
-description_label.place(relx=0.5, rely=0.20, anchor="center")  # Centered text
-
-initialize_arduino()
-
-add_step_button = tk.Button(root, text="Add step", command=open_add_step_window, bg="blue", fg="white",
-                            font=("Helvetica", 14), width=8)
-add_step_button.place(relx=0.42, rely=0.3, anchor="center")
+            self.sensor_data_window.deiconify()
+        self.start_sensor_graph()
 
-open_button = tk.Button(root, text="Open saved files", command=open_experiment, bg="blue", fg="white",
-                        font=("Helvetica", 14), width=14)
-open_button.place(relx=0.58, rely=0.3, anchor="center")
 
-queue_label = tk.Label(root, text="Experiment queue:", font=("Helvetica", 16), bg="light blue")
-queue_label.place(relx=0.5, rely=0.39, anchor="center")
+    # Builds the sensor data window and its graph, and returns the function that starts plotting on it.
+    def build_sensor_data_window(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
 
-queue_listbox = tk.Listbox(root, font=("Helvetica", 12), height=10, width=71, selectmode=tk.SINGLE)
-queue_listbox.place(relx=0.5, rely=0.59, anchor="center")  # Adjusts dynamically
+        self.sensor_data_window = tk.Toplevel(self.root)
+        self.sensor_data_window.title("Sensor Data")
+        self.sensor_data_window.geometry("600x400")
 
-queue_listbox.bind("<ButtonRelease-1>", on_step_click)
-root.bind("<Button-1>", on_click_outside)
+        fig = Figure(figsize=(6, 4))
+        ax = fig.add_subplot(111)
+        ax.set_title("Real-time Sensor Data")
+        ax.set_xlabel("Time (s)")
+        ax.set_ylabel("LED Intensity (lux)")
+        ax.set_ylim(0, 100)
 
-time_label = tk.Label(root, text="Elapsed Time: 0 seconds", font=("Helvetica", 14), bg="light blue")
+        line, = ax.plot([], [], "b-", animated=True)
 
-run_button = tk.Button(root, text="Run", command=run_experiment, bg="green", fg="white",
-                       font=("Helvetica", 14), width=5)
-run_button.place(relx=0.5, rely=0.8, anchor="center")  # Centered
+        canvas = FigureCanvasTkAgg(fig, master=self.sensor_data_window)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
-save_button = tk.Button(root, text="Save", command=save_experiment, bg="blue", fg="white",
-                        font=("Helvetica", 14), width=6)
-save_button.place(relx=0.35, rely=0.8, anchor="center")
+        background = None
+        drawn_count = None
 
-reset_button = tk.Button(root, text="Clear all", command=reset_experiment, bg="red", fg="white",
-                         font=("Helvetica", 14), width=8)
-reset_button.place(relx=0.65, rely=0.8, anchor="center")
+        # The axes without the line are saved after every full redraw of the figure (e.g. when resized).
+        def save_background(event):
+            nonlocal background
+            background = canvas.copy_from_bbox(ax.bbox)
+            ax.draw_artist(line)
 
-delete_button = tk.Button(root, text="Delete step", command=delete_step, bg="red", fg="white", font=("Helvetica", 14), width=10)
+        def update_graph():
+            nonlocal drawn_count
 
-view_sensor_button = tk.Button(root, text="View sensor data      ", command=open_sensor_data_window, bg="blue", fg="white", font=("Helvetica", 14), width=18)
-
-
-image = tk.PhotoImage(
-        file="C:\\Users\\lucia\\OneDrive - Imperial College London\\##Year 3 AFTER interruption\\Group project\\#GUI\\info_icon.png")
-image_resize = image.subsample(17, 17)
-info_icon = tk.Button(root, image=image_resize, command=open_sensor_data_window, bg="blue", bd=0)
-
-
-# Displays a tooltip near the mouse pointer when triggered, showing a description of what the 'View sensor data' button does.
-def show_tooltip(event):
-    tooltip = tk.Toplevel(root)
-    tooltip.wm_overrideredirect(True)
-
-    tooltip.geometry(f"+{event.x_root + 10}+{event.y_root + 10}")
-
-    tooltip.configure(bg="white")
-
-    label = tk.Label(
-        tooltip,
-        text="Click to view LED intensity values (lux) recorded in real-time by the light sensor inside IllumiCell.",
-        bg="white",
-        fg="black",
-        font=("Helvetica", 11),
-        wraplength=250,
-        justify="left",
-        padx=10,
-        pady=5
-    )
-
-    label.pack()
-    event.widget.tooltip = tooltip
-
-
-# Hides the tooltip when the user moves the mouse away.
-def hide_tooltip(event):
-    if hasattr(event.widget, 'tooltip'):
-        event.widget.tooltip.destroy()
-        event.widget.tooltip = None
-
-info_icon.bind("<Enter>", show_tooltip)
-info_icon.bind("<Leave>", hide_tooltip)
-
-update_queue_listbox()
+            if not (self.experiment_running and self.arduino is not None):
+                self.close_sensor_data_window()
+                return
 
-root.mainloop()
+            if (background is not None and self.sensor_readings.count != drawn_count
+                    and self.sensor_data_window.winfo_viewable()):
+                drawn_count = self.sensor_readings.count
+                received_at, values = self.sensor_readings.latest()
+                seconds = (received_at - self.start_ns) / 1e9
+
+                axis_moved = len(seconds) > 0 and seconds[-1] > ax.get_xlim()[1]
+                if axis_moved:
+                    ax.set_xlim(seconds[-1] - SENSOR_PLOT_SECONDS / 2, seconds[-1] + SENSOR_PLOT_SECONDS / 2)
+
+                # Only the readings inside the visible time window are handed to the line.
+                first_visible = np.searchsorted(seconds, ax.get_xlim()[0])
+                line.set_data(seconds[first_visible:], values[first_visible:])
+
+                if axis_moved:
+                    canvas.draw()
+                else:
+                    canvas.restore_region(background)
+                    ax.draw_artist(line)
+                    canvas.blit(ax.bbox)
+
+            self.sensor_update_id = self.sensor_data_window.after(100, update_graph)
+
+        # Empties the graph and starts updating it every 100ms.
+        def start_graph():
+            nonlocal drawn_count
+            self.sensor_readings.clear()
+            drawn_count = None
+            line.set_data([], [])
+            ax.set_xlim(0, SENSOR_PLOT_SECONDS)
+            canvas.draw()
+            update_graph()
+
+        canvas.mpl_connect("draw_event", save_background)
+        self.sensor_data_window.protocol("WM_DELETE_WINDOW", lambda: self.close_sensor_data_window())
+        return start_graph
+
+
+    # This function hides the sensor data window and stops updating the graph, keeping the window to be shown
+    # again the next time it is opened. It is triggered when the window's close button is clicked.
+    def close_sensor_data_window(self):
+        if self.sensor_update_id is not None:
+            self.root.after_cancel(self.sensor_update_id)
+            self.sensor_update_id = None
+        if self.sensor_data_window is not None:
+            self.sensor_data_window.withdraw()
+
+
+    # Displays a tooltip near the mouse pointer when triggered, showing a description of what the 'View sensor data' button does.
+    # The tooltip window is built once at startup and only moved and shown here.
+    def show_tooltip(self, event):
+        self.tooltip.geometry(f"+{event.x_root + 10}+{event.y_root + 10}")
+        self.tooltip.deiconify()
+        self.tooltip_shown = True
+
+
+    # Hides the tooltip when the user moves the mouse away. Nothing is sent to Tk if it is already hidden.
+    def hide_tooltip(self, event):
+        if self.tooltip_shown:
+            self.tooltip.withdraw()
+            self.tooltip_shown = False
+
+
+if __name__ == "__main__":
+    IllumiCellApp().startup()